@@ -1,14 +1,24 @@
-import requests
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Path, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, Response, StreamingResponse
 import json
 import os
-import uvicorn
+import hashlib
+import hmac
+import sys
+import threading
+import contextvars
+import mmap
+import struct
+import zlib
+from bisect import bisect_left
 from difflib import get_close_matches
 import sqlite3
 import time
 from typing import Dict, List, Any, Optional
 from functools import lru_cache
+from collections import Counter
+from contextlib import contextmanager
 import asyncio
 import aiohttp
 
@@ -29,8 +39,195 @@ MOVESET_URLS = [
     "https://pokeapi.co/api/v2/pokemon/{pokemon}/"  # PokeAPI endpoint for Pokemon data
 ]
 
+# Sprite proxy configuration
+SPRITE_UPSTREAM_BASE = os.environ.get(
+    'SPRITE_UPSTREAM_BASE',
+    "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon"
+).rstrip('/')
+SPRITE_KINDS = {
+    "artwork": ("other/official-artwork/{id}.png", "image/png"),
+    "animated": ("versions/generation-v/black-white/animated/{id}.gif", "image/gif"),
+}
+SPRITE_CACHE_DIR = os.environ.get('SPRITE_CACHE_DIR', 'sprite_cache')
+SPRITE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+SPRITE_MISS_TTL = 7 * 24 * 60 * 60  # how long an upstream 404 is remembered
+# PokeAPI numbers species from 1 and alternate forms from 10001; only IDs in
+# these ranges (with headroom for new releases) are proxied upstream
+SPRITE_ID_RANGES = ((1, 1100), (10001, 10400))
+
+# Diagnostics configuration
+SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING', '1') != '0'
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')  # admin endpoints are disabled when unset
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_MAX_SECONDS = 300
+
 # Database configuration
 DB_PATH = 'pokemon.db'
+SCHEMA_VERSION = 1  # bump whenever the tables below change so existing databases get migrated
+PROCESSED_TTL = 24 * 60 * 60  # processed responses are served from cache for 1 day
+
+# Shared upstream HTTP client (created on first use, closed on shutdown)
+HTTP_SESSION: Optional[aiohttp.ClientSession] = None
+
+def get_http_session():
+    global HTTP_SESSION
+    if HTTP_SESSION is None or HTTP_SESSION.closed:
+        HTTP_SESSION = aiohttp.ClientSession()
+    return HTTP_SESSION
+
+async def close_http_session():
+    global HTTP_SESSION
+    if HTTP_SESSION is not None and not HTTP_SESSION.closed:
+        await HTTP_SESSION.close()
+    HTTP_SESSION = None
+
+# Per-request stage timings, reported in the Server-Timing header
+REQUEST_TIMINGS: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    'request_timings', default=None
+)
+
+@contextmanager
+def timed(stage):
+    """Add the time spent in a block to the current request's Server-Timing stage"""
+    timings = REQUEST_TIMINGS.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + (time.perf_counter() - start) * 1000
+
+class RequestDiagnosticsMiddleware:
+    """ASGI middleware that counts requests for the profiler and, unless
+    SERVER_TIMING=0, adds a Server-Timing header to every HTTP response"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        if not SERVER_TIMING_ENABLED:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.request_finished(scope)
+            return
+        
+        timings = {}
+        token = REQUEST_TIMINGS.set(timings)
+        start = time.perf_counter()
+        
+        async def send_with_timing(message):
+            if message['type'] == 'http.response.start':
+                entries = [f"{stage};dur={duration:.1f}" for stage, duration in timings.items()]
+                entries.append(f"total;dur={(time.perf_counter() - start) * 1000:.1f}")
+                headers = list(message.get('headers', []))
+                headers.append((b'server-timing', ', '.join(entries).encode('latin-1')))
+                headers.append((b'timing-allow-origin', b'*'))
+                message = {**message, 'headers': headers}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            REQUEST_TIMINGS.reset(token)
+            self.request_finished(scope)
+    
+    @staticmethod
+    def request_finished(scope):
+        # Admin requests don't count towards a request-limited profile
+        if not scope['path'].startswith('/admin/'):
+            PROFILER.request_finished()
+
+class SamplingProfiler:
+    """Samples the event loop thread's stack from a background thread.
+    
+    Results are written in the collapsed-stack format ("frame;frame;frame count")
+    read by flamegraph.pl, speedscope and inferno.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.remaining_requests = None
+        self.output_path = None
+        self.samples = 0
+        self.runs = 0
+    
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+    
+    def start(self, seconds=None, request_count=None, interval=0.005):
+        """Start sampling the calling thread; must be called from the event loop"""
+        with self.lock:
+            if self.running:
+                raise RuntimeError("A profile is already running")
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            # The pid and run counter keep names unique across workers and back-to-back profiles
+            self.runs += 1
+            self.output_path = os.path.join(
+                PROFILE_DIR, f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self.runs}.folded"
+            )
+            self.samples = 0
+            self.remaining_requests = request_count
+            self.stop_event = threading.Event()
+            duration = min(seconds or PROFILE_MAX_SECONDS, PROFILE_MAX_SECONDS)
+            self.thread = threading.Thread(
+                target=self._run,
+                args=(threading.get_ident(), duration, interval, self.output_path),
+                name="sampling-profiler",
+                daemon=True
+            )
+            self.thread.start()
+            return self.output_path
+    
+    def stop(self, timeout=5):
+        """Stop a running profile and wait for its file to be written"""
+        if self.running:
+            self.stop_event.set()
+            self.thread.join(timeout)
+    
+    def request_finished(self):
+        """Count a finished request towards a request-limited profile"""
+        if self.remaining_requests is None:
+            return
+        with self.lock:
+            if self.remaining_requests is None:
+                return
+            self.remaining_requests -= 1
+            if self.remaining_requests <= 0:
+                self.remaining_requests = None
+                self.stop_event.set()
+    
+    def _run(self, target_thread, duration, interval, output_path):
+        stacks = Counter()
+        deadline = time.monotonic() + duration
+        while not self.stop_event.wait(interval) and time.monotonic() < deadline:
+            frame = sys._current_frames().get(target_thread)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                stacks[';'.join(reversed(stack))] += 1
+                self.samples += 1
+        
+        with open(output_path, 'w') as f:
+            for stack, count in stacks.items():
+                f.write(f"{stack} {count}\n")
+        self.remaining_requests = None
+        print(f"Profile written to {output_path} ({self.samples} samples)")
+
+PROFILER = SamplingProfiler()
+
+app.add_middleware(RequestDiagnosticsMiddleware)
 
 # Initialize SQLite database with connection pooling
 def get_db_connection():
@@ -43,6 +240,9 @@ def initialize_database():
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
+        # Skip the DDL when the schema is already up to date
+        if cursor.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+            return
         print("[DEBUG] Initializing database tables...")
         # Table for raw Pokemon data
         cursor.execute("""
@@ -91,6 +291,18 @@ def initialize_database():
                 timestamp INTEGER
             )
         """)
+        # Table mapping sprites to their content-addressed files on disk
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sprites (
+                kind TEXT,
+                pokemon_id INTEGER,
+                digest TEXT,
+                content_type TEXT,
+                timestamp INTEGER,
+                PRIMARY KEY (kind, pokemon_id)
+            )
+        """)
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
     finally:
         conn.close()
@@ -210,45 +422,227 @@ TYPE_STRENGTHS = {
 
 # Cache for pokemon names
 POKEMON_NAMES = []
+NAME_INDEX = None
+
+def build_length_buckets(names):
+    """Order name indices by length and record where each length starts"""
+    by_length = sorted(range(len(names)), key=lambda i: len(names[i]))
+    lengths = [len(names[i]) for i in by_length]
+    max_len = lengths[-1] if lengths else 0
+    length_offsets = [bisect_left(lengths, length) for length in range(max_len + 2)]
+    return by_length, length_offsets
+
+class NameIndex:
+    """Fuzzy-match index over the Pokemon names, bucketed by name length"""
+    
+    def __init__(self, names, by_length=None, length_offsets=None):
+        if by_length is None:
+            by_length, length_offsets = build_length_buckets(names)
+        self.exact = set(names)
+        self.names_by_length = [names[i] for i in by_length]
+        self.length_offsets = length_offsets
+    
+    def best_match(self, query, cutoff=0.6):
+        """Return the same name as get_close_matches(query, names, n=1, cutoff=cutoff)"""
+        if query in self.exact:
+            return query
+        
+        # ratio() is at most 2*min(len)/(sum of lens), so names outside this
+        # length window can never reach the cutoff
+        min_len = int(len(query) * cutoff / (2 - cutoff))
+        max_len = min(int(len(query) * (2 - cutoff) / cutoff) + 1, len(self.length_offsets) - 2)
+        if min_len > max_len:
+            return None
+        candidates = self.names_by_length[self.length_offsets[min_len]:self.length_offsets[max_len + 1]]
+        matches = get_close_matches(query, candidates, n=1, cutoff=cutoff)
+        return matches[0] if matches else None
 
 # Load pokemon names from json file
 def load_pokemon_names():
-    global POKEMON_NAMES
+    global POKEMON_NAMES, NAME_INDEX
     try:
         with open('pokemon.json', 'r') as f:
             pokemon_data = json.load(f)
         POKEMON_NAMES = [p['name'] for p in pokemon_data['pokemon']]
+        NAME_INDEX = NameIndex(POKEMON_NAMES)
         return POKEMON_NAMES
     except (FileNotFoundError, json.JSONDecodeError) as e:
         print(f"Error loading Pokemon names: {e}")
         return []
 
-# Data retrieval functions
-async def fetch_pokemon_data(session, name):
-    """Fetch Pokemon data from the API or database"""
-    # Check database first
+# Startup snapshot: a memory-mapped copy of the name index and the hottest processed responses.
+# Only the responses are served from the shared pages; names are decoded into each worker at load.
+SNAPSHOT_PATH = os.environ.get('SNAPSHOT_PATH', 'pokemon.snapshot')
+SNAPSHOT_MAGIC = b'PKSNAP\x00\x00'
+SNAPSHOT_VERSION = 2
+SNAPSHOT_TOP_N = 200
+# magic, version, payload crc32, payload length, sha256 of pokemon.json, build time
+# (64 bytes, keeps the payload 8-byte aligned)
+SNAPSHOT_HEADER = struct.Struct('<8sIIQ32sq')
+# name count, max name length, response count, names blob length, response names blob length
+SNAPSHOT_COUNTS = struct.Struct('<IIIQQ')
+# response JSON offset (from the start of the JSON area), length, timestamp
+SNAPSHOT_ENTRY = struct.Struct('<QIq')
+
+SNAPSHOT_MMAP = None
+SNAPSHOT_RESPONSES = {}  # name -> (file offset, length, timestamp)
+
+def _pad(buf, alignment=8):
+    buf.extend(b'\x00' * (-len(buf) % alignment))
+
+def build_snapshot(path=SNAPSHOT_PATH, top_n=SNAPSHOT_TOP_N):
+    """Write a snapshot of pokemon.json's names and the most recently processed fresh responses"""
+    try:
+        with open('pokemon.json', 'rb') as f:
+            source = f.read()
+        names = [p['name'] for p in json.loads(source)['pokemon']]
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error building snapshot: {e}")
+        return False
+    by_length, length_offsets = build_length_buckets(names)
+    
     conn = get_db_connection()
     try:
         cur = conn.cursor()
-        cur.execute("SELECT data, timestamp FROM pokemon_data WHERE name=?", (name,))
-        row = cur.fetchone()
-        
-        # If data exists and is less than 7 days old, use it
-        if row and (time.time() - row['timestamp'] < 7 * 24 * 60 * 60):
-            print(f"Using cached data for {name}")
-            return json.loads(row['data'])
+        cur.execute(
+            "SELECT name, data, timestamp FROM processed_pokemon WHERE timestamp > ? ORDER BY timestamp DESC LIMIT ?",
+            (int(time.time()) - PROCESSED_TTL, top_n)
+        )
+        rows = cur.fetchall()
+    except sqlite3.OperationalError:
+        rows = []
     finally:
         conn.close()
     
+    names_blob = '\x00'.join(names).encode()
+    response_names_blob = '\x00'.join(row['name'] for row in rows).encode()
+    responses = [json.dumps(json.loads(row['data']), separators=(',', ':')).encode() for row in rows]
+    
+    payload = bytearray(SNAPSHOT_COUNTS.pack(
+        len(names), len(length_offsets) - 2, len(rows), len(names_blob), len(response_names_blob)
+    ))
+    payload += names_blob
+    _pad(payload)
+    payload += struct.pack(f'{len(by_length)}I', *by_length)
+    payload += struct.pack(f'{len(length_offsets)}I', *length_offsets)
+    payload += response_names_blob
+    _pad(payload)
+    offset = 0
+    for row, data in zip(rows, responses):
+        payload += SNAPSHOT_ENTRY.pack(offset, len(data), row['timestamp'])
+        offset += len(data)
+    for data in responses:
+        payload += data
+    
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, zlib.crc32(payload), len(payload), hashlib.sha256(source).digest(),
+        int(time.time())
+    )
+    # Write atomically so workers starting concurrently never map a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+    print(f"Snapshot written to {path} ({len(names)} names, {len(rows)} responses)")
+    return True
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """Memory-map the snapshot; returns False if it is missing, corrupt or stale"""
+    global POKEMON_NAMES, NAME_INDEX, SNAPSHOT_MMAP, SNAPSHOT_RESPONSES
+    try:
+        with open('pokemon.json', 'rb') as f:
+            source_digest = hashlib.sha256(f.read()).digest()
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return False
+    
+    header_size = SNAPSHOT_HEADER.size
+    if len(mm) < header_size + SNAPSHOT_COUNTS.size:
+        mm.close()
+        return False
+    magic, version, crc, payload_len, digest, built_at = SNAPSHOT_HEADER.unpack_from(mm, 0)
+    # Every response in the snapshot was fresh at build time, so they have all
+    # expired once the snapshot itself is older than the freshness window
+    valid = (
+        magic == SNAPSHOT_MAGIC
+        and version == SNAPSHOT_VERSION
+        and digest == source_digest
+        and payload_len == len(mm) - header_size
+        and time.time() - built_at < PROCESSED_TTL
+    )
+    if valid:
+        with memoryview(mm)[header_size:] as payload:
+            valid = zlib.crc32(payload) == crc
+    if not valid:
+        print(f"Snapshot {path} is stale or corrupt")
+        mm.close()
+        return False
+    
+    name_count, max_len, response_count, names_len, response_names_len = SNAPSHOT_COUNTS.unpack_from(mm, header_size)
+    pos = header_size + SNAPSHOT_COUNTS.size
+    names = mm[pos:pos + names_len].decode().split('\x00') if name_count else []
+    pos += names_len
+    pos += -pos % 8
+    by_length = memoryview(mm)[pos:pos + 4 * name_count].cast('I')
+    pos += 4 * name_count
+    length_offsets = memoryview(mm)[pos:pos + 4 * (max_len + 2)].cast('I')
+    pos += 4 * (max_len + 2)
+    response_names = mm[pos:pos + response_names_len].decode().split('\x00') if response_count else []
+    pos += response_names_len
+    pos += -pos % 8
+    responses_start = pos + SNAPSHOT_ENTRY.size * response_count
+    responses = {}
+    for i, response_name in enumerate(response_names):
+        offset, length, timestamp = SNAPSHOT_ENTRY.unpack_from(mm, pos + SNAPSHOT_ENTRY.size * i)
+        responses[response_name] = (responses_start + offset, length, timestamp)
+    
+    POKEMON_NAMES = names
+    NAME_INDEX = NameIndex(names, by_length, length_offsets)
+    SNAPSHOT_MMAP = mm
+    SNAPSHOT_RESPONSES = responses
+    print(f"Loaded snapshot {path} ({name_count} names, {response_count} responses)")
+    return True
+
+def snapshot_response(name):
+    """Return a processed response from the snapshot if it is still fresh"""
+    entry = SNAPSHOT_RESPONSES.get(name)
+    # Same freshness as the processed_pokemon table
+    if entry and (time.time() - entry[2] < PROCESSED_TTL):
+        offset, length, _ = entry
+        return json.loads(SNAPSHOT_MMAP[offset:offset + length])
+    return None
+
+# Data retrieval functions
+async def fetch_pokemon_data(session, name):
+    """Fetch Pokemon data from the API or database"""
+    # Check database first
+    with timed('db'):
+        conn = get_db_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT data, timestamp FROM pokemon_data WHERE name=?", (name,))
+            row = cur.fetchone()
+        
+            # If data exists and is less than 7 days old, use it
+            if row and (time.time() - row['timestamp'] < 7 * 24 * 60 * 60):
+                print(f"Using cached data for {name}")
+                return json.loads(row['data'])
+        finally:
+            conn.close()
+    
     # If not in database or too old, fetch from API
     try:
-        async with session.get(f"https://pokeapi.co/api/v2/pokemon/{name}") as response:
-            if response.status != 200:
-                raise HTTPException(status_code=404, detail=f"Pokemon {name} not found")
-            
-            data = await response.json()
+        with timed('upstream'):
+            async with session.get(f"https://pokeapi.co/api/v2/pokemon/{name}") as response:
+                if response.status != 200:
+                    raise HTTPException(status_code=404, detail=f"Pokemon {name} not found")
             
-            # Save to database
+                data = await response.json()
+        
+        # Save to database
+        with timed('db'):
             conn = get_db_connection()
             try:
                 cur = conn.cursor()
@@ -259,35 +653,38 @@ async def fetch_pokemon_data(session, name):
                 conn.commit()
             finally:
                 conn.close()
-                
-            return data
+        
+        return data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch pokemon data: {str(e)}")
 
 async def fetch_species_data(session, name):
     """Fetch Pokemon species data from the API or database"""
     # Check database first
-    conn = get_db_connection()
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT data, timestamp FROM pokemon_species WHERE name=?", (name,))
-        row = cur.fetchone()
+    with timed('db'):
+        conn = get_db_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT data, timestamp FROM pokemon_species WHERE name=?", (name,))
+            row = cur.fetchone()
         
-        # If data exists and is less than 30 days old, use it
-        if row and (time.time() - row['timestamp'] < 30 * 24 * 60 * 60):
-            return json.loads(row['data'])
-    finally:
-        conn.close()
+            # If data exists and is less than 30 days old, use it
+            if row and (time.time() - row['timestamp'] < 30 * 24 * 60 * 60):
+                return json.loads(row['data'])
+        finally:
+            conn.close()
     
     # If not in database or too old, fetch from API
     try:
-        async with session.get(f"https://pokeapi.co/api/v2/pokemon-species/{name}/") as response:
-            if response.status != 200:
-                raise HTTPException(status_code=404, detail=f"Pokemon species {name} not found")
+        with timed('upstream'):
+            async with session.get(f"https://pokeapi.co/api/v2/pokemon-species/{name}/") as response:
+                if response.status != 200:
+                    raise HTTPException(status_code=404, detail=f"Pokemon species {name} not found")
             
-            data = await response.json()
-            
-            # Save to database
+                data = await response.json()
+        
+        # Save to database
+        with timed('db'):
             conn = get_db_connection()
             try:
                 cur = conn.cursor()
@@ -298,8 +695,8 @@ async def fetch_species_data(session, name):
                 conn.commit()
             finally:
                 conn.close()
-                
-            return data
+        
+        return data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch species data: {str(e)}")
 
@@ -309,27 +706,30 @@ async def fetch_evolution_chain(session, chain_url):
     chain_id = int(chain_url.split('/')[-2])
     
     # Check database first
-    conn = get_db_connection()
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT data, timestamp FROM evolution_chains WHERE id=?", (chain_id,))
-        row = cur.fetchone()
+    with timed('db'):
+        conn = get_db_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT data, timestamp FROM evolution_chains WHERE id=?", (chain_id,))
+            row = cur.fetchone()
         
-        # If data exists and is less than 30 days old, use it
-        if row and (time.time() - row['timestamp'] < 30 * 24 * 60 * 60):
-            return json.loads(row['data'])
-    finally:
-        conn.close()
+            # If data exists and is less than 30 days old, use it
+            if row and (time.time() - row['timestamp'] < 30 * 24 * 60 * 60):
+                return json.loads(row['data'])
+        finally:
+            conn.close()
     
     # If not in database or too old, fetch from API
     try:
-        async with session.get(chain_url) as response:
-            if response.status != 200:
-                raise HTTPException(status_code=404, detail=f"Evolution chain {chain_id} not found")
-            
-            data = await response.json()
+        with timed('upstream'):
+            async with session.get(chain_url) as response:
+                if response.status != 200:
+                    raise HTTPException(status_code=404, detail=f"Evolution chain {chain_id} not found")
             
-            # Save to database
+                data = await response.json()
+        
+        # Save to database
+        with timed('db'):
             conn = get_db_connection()
             try:
                 cur = conn.cursor()
@@ -340,8 +740,8 @@ async def fetch_evolution_chain(session, chain_url):
                 conn.commit()
             finally:
                 conn.close()
-                
-            return data
+        
+        return data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch evolution chain: {str(e)}")
 
@@ -354,9 +754,10 @@ async def fetch_movesets(session, pokemon_name):
     try:
         # Helper function to check database
         def check_db(name):
-            cur = conn.cursor()
-            cur.execute("SELECT data, timestamp FROM movesets WHERE pokemon_name=?", (name,))
-            row = cur.fetchone()
+            with timed('db'):
+                cur = conn.cursor()
+                cur.execute("SELECT data, timestamp FROM movesets WHERE pokemon_name=?", (name,))
+                row = cur.fetchone()
             if row and (time.time() - row['timestamp'] < 30 * 24 * 60 * 60):
                 print(f"[DEBUG] Found cached movesets for {name}")
                 return json.loads(row['data'])
@@ -377,12 +778,13 @@ async def fetch_movesets(session, pokemon_name):
             if db_movesets:
                 print(f"[DEBUG] Found movesets from base form {base_form}")
                 # Save these movesets for the special form too
-                cur = conn.cursor()
-                cur.execute(
-                    "INSERT OR REPLACE INTO movesets (pokemon_name, data, timestamp) VALUES (?, ?, ?)",
-                    (pokemon_name, json.dumps(db_movesets), int(time.time()))
-                )
-                conn.commit()
+                with timed('db'):
+                    cur = conn.cursor()
+                    cur.execute(
+                        "INSERT OR REPLACE INTO movesets (pokemon_name, data, timestamp) VALUES (?, ?, ?)",
+                        (pokemon_name, json.dumps(db_movesets), int(time.time()))
+                    )
+                    conn.commit()
                 return db_movesets
         
         print(f"[DEBUG] Attempting to fetch movesets from PokeAPI for {pokemon_name}")
@@ -393,12 +795,13 @@ async def fetch_movesets(session, pokemon_name):
         if movesets:  # Valid movesets found
             print(f"[DEBUG] Got valid movesets from PokeAPI: {len(movesets)} sets")
             # Save movesets to database
-            cur = conn.cursor()
-            cur.execute(
-                "INSERT OR REPLACE INTO movesets (pokemon_name, data, timestamp) VALUES (?, ?, ?)",
-                (pokemon_name, json.dumps(movesets), int(time.time()))
-            )
-            conn.commit()
+            with timed('db'):
+                cur = conn.cursor()
+                cur.execute(
+                    "INSERT OR REPLACE INTO movesets (pokemon_name, data, timestamp) VALUES (?, ?, ?)",
+                    (pokemon_name, json.dumps(movesets), int(time.time()))
+                )
+                conn.commit()
             return movesets
         else:
             print(f"[DEBUG] No valid movesets from PokeAPI")
@@ -418,14 +821,16 @@ async def fetch_moveset_url(session, url, pokemon_name):
         formatted_url = url.format(pokemon=pokemon_name.lower())
         print(f"[DEBUG] Fetching moves from {formatted_url}")
         
-        async with session.get(formatted_url) as response:
-            if response.status != 200:
-                print(f"[DEBUG] Error: HTTP {response.status} for {formatted_url}")
-                return []
-            
-            print(f"[DEBUG] Got 200 response from {formatted_url}")
-            data = await response.json()
-            
+        with timed('upstream'):
+            async with session.get(formatted_url) as response:
+                if response.status != 200:
+                    print(f"[DEBUG] Error: HTTP {response.status} for {formatted_url}")
+                    return []
+                
+                print(f"[DEBUG] Got 200 response from {formatted_url}")
+                data = await response.json()
+        
+        with timed('moveset'):
             # Extract moves from the Pokemon's moveset
             if 'moves' in data:
                 print(f"[DEBUG] Found 'moves' field in response with {len(data['moves'])} moves")
@@ -550,39 +955,324 @@ def extract_evolution_names(evolution):
 
 def check_processed_cache(name):
     """Check if we have a processed response cached for this pokemon"""
+    snapshot_data = snapshot_response(name)
+    if snapshot_data:
+        print(f"Using snapshot cache for {name}")
+        return snapshot_data
+    
+    with timed('db'):
+        conn = get_db_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT data, timestamp FROM processed_pokemon WHERE name=?", (name,))
+            row = cur.fetchone()
+            
+            # If data exists and is less than 1 day old, use it
+            if row and (time.time() - row['timestamp'] < PROCESSED_TTL):
+                print(f"Using processed cache for {name}")
+                return json.loads(row['data'])
+            return None
+        finally:
+            conn.close()
+
+def save_processed_data(name, data):
+    """Save processed pokemon data to cache"""
+    with timed('db'):
+        conn = get_db_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                "INSERT OR REPLACE INTO processed_pokemon (name, data, timestamp) VALUES (?, ?, ?)",
+                (name, json.dumps(data), int(time.time()))
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+# Sprite proxy helpers
+SPRITE_FETCHES: Dict[tuple, asyncio.Future] = {}  # in-flight upstream sprite downloads
+
+def sprite_path(digest):
+    """Path of a sprite in the content-addressed store"""
+    return os.path.join(SPRITE_CACHE_DIR, digest[:2], digest)
+
+def sprite_not_found(kind, pokemon_id):
+    """404 for a sprite upstream doesn't have, cacheable by browsers for the miss TTL"""
+    return HTTPException(
+        status_code=404,
+        detail=f"Sprite {kind}/{pokemon_id} not found",
+        headers={"Cache-Control": f"public, max-age={SPRITE_MISS_TTL}"}
+    )
+
+def lookup_sprite(kind, pokemon_id):
+    """Return (digest, content_type) for a sprite already on disk, or None.
+    
+    A recorded upstream miss that is still fresh comes back as (None, None).
+    """
+    with timed('db'):
+        conn = get_db_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT digest, content_type, timestamp FROM sprites WHERE kind=? AND pokemon_id=?", (kind, pokemon_id))
+            row = cur.fetchone()
+            if not row:
+                return None
+            if row['digest'] is None:
+                if time.time() - row['timestamp'] < SPRITE_MISS_TTL:
+                    return None, None
+                return None
+            if os.path.exists(sprite_path(row['digest'])):
+                return row['digest'], row['content_type']
+            return None
+        finally:
+            conn.close()
+
+def record_sprite_miss(kind, pokemon_id):
+    """Remember that upstream has no such sprite so we don't ask again for a while"""
     conn = get_db_connection()
     try:
         cur = conn.cursor()
-        cur.execute("SELECT data, timestamp FROM processed_pokemon WHERE name=?", (name,))
-        row = cur.fetchone()
-        
-        # If data exists and is less than 1 day old, use it
-        if row and (time.time() - row['timestamp'] < 24 * 60 * 60):
-            print(f"Using processed cache for {name}")
-            return json.loads(row['data'])
-        return None
+        cur.execute(
+            "INSERT OR REPLACE INTO sprites (kind, pokemon_id, digest, content_type, timestamp) VALUES (?, ?, NULL, NULL, ?)",
+            (kind, pokemon_id, int(time.time()))
+        )
+        conn.commit()
     finally:
         conn.close()
 
-def save_processed_data(name, data):
-    """Save processed pokemon data to cache"""
+def store_sprite(kind, pokemon_id, body, content_type):
+    """Write sprite bytes to the content-addressed store and index them"""
+    digest = hashlib.sha256(body).hexdigest()
+    path = sprite_path(digest)
+    # Identical images share one file; write atomically so readers never see partial data
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+    
     conn = get_db_connection()
     try:
         cur = conn.cursor()
         cur.execute(
-            "INSERT OR REPLACE INTO processed_pokemon (name, data, timestamp) VALUES (?, ?, ?)",
-            (name, json.dumps(data), int(time.time()))
+            "INSERT OR REPLACE INTO sprites (kind, pokemon_id, digest, content_type, timestamp) VALUES (?, ?, ?, ?, ?)",
+            (kind, pokemon_id, digest, content_type, int(time.time()))
         )
         conn.commit()
     finally:
         conn.close()
+    return digest
+
+async def download_sprite(session, kind, pokemon_id):
+    """Download a sprite from upstream into the local store"""
+    template, content_type = SPRITE_KINDS[kind]
+    url = f"{SPRITE_UPSTREAM_BASE}/{template.format(id=pokemon_id)}"
+    try:
+        with timed('upstream'):
+            async with session.get(url) as response:
+                status = response.status
+                if status == 200:
+                    body = await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch sprite: {str(e)}")
+    
+    if status == 404:
+        with timed('store'):
+            record_sprite_miss(kind, pokemon_id)
+        raise sprite_not_found(kind, pokemon_id)
+    if status != 200:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch sprite: HTTP {status}")
+    
+    print(f"Cached {kind} sprite for {pokemon_id} ({len(body)} bytes)")
+    with timed('store'):
+        return store_sprite(kind, pokemon_id, body, content_type), content_type
+
+async def fetch_sprite(session, kind, pokemon_id):
+    """Return (digest, content_type) for a sprite, fetching it upstream at most once"""
+    cached = lookup_sprite(kind, pokemon_id)
+    if cached:
+        if cached[0] is None:
+            raise sprite_not_found(kind, pokemon_id)
+        return cached
+    
+    # Concurrent requests for the same sprite share a single download
+    key = (kind, pokemon_id)
+    task = SPRITE_FETCHES.get(key)
+    if task is None:
+        task = asyncio.ensure_future(download_sprite(session, kind, pokemon_id))
+        SPRITE_FETCHES[key] = task
+        task.add_done_callback(lambda _: SPRITE_FETCHES.pop(key, None))
+    return await asyncio.shield(task)
+
+def parse_byte_range(header, size):
+    """Parse a single 'bytes=start-end' range header.
+    
+    Returns an inclusive (start, end) tuple, or None if the header should be
+    ignored and the whole file served. Raises a 416 if it cannot be satisfied.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    start_str, sep, end_str = spec.strip().partition('-')
+    if not sep:
+        return None
+    try:
+        if start_str:
+            start = int(start_str)
+            end = int(end_str) if end_str else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(end_str), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    if start < 0 or end < start:
+        return None
+    return start, min(end, size - 1)
+
+def iter_file_range(path, start, length, chunk_size=64 * 1024):
+    """Yield `length` bytes of a file from `start` in chunks"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+def sprite_response(request, digest, content_type):
+    """Serve a stored sprite with caching, conditional and range support"""
+    path = sprite_path(digest)
+    etag = f'"{digest}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": SPRITE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [t.strip() for t in if_none_match.split(',')]
+        tags = [t[2:] if t.startswith('W/') else t for t in tags]
+        if etag in tags or '*' in tags:
+            return Response(status_code=304, headers=headers)
+    
+    stat_result = os.stat(path)
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        byte_range = parse_byte_range(range_header, stat_result.st_size)
+        if byte_range:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{stat_result.st_size}"
+            headers["Content-Length"] = str(end - start + 1)
+            return StreamingResponse(
+                iter_file_range(path, start, end - start + 1),
+                status_code=206,
+                media_type=content_type,
+                headers=headers
+            )
+    
+    return FileResponse(path, media_type=content_type, headers=headers, stat_result=stat_result)
+
+def with_sprite_urls(data):
+    """Point the sprite URLs of a response at the local sprite proxy.
+    
+    The URLs are relative so they keep the page's scheme and host behind a proxy;
+    the frontend prefixes them with the API base URL.
+    """
+    details = dict(data['details'])
+    details['preview'] = str(app.url_path_for('sprite', kind='artwork', pokemon_id=data['id']))
+    details['animated'] = str(app.url_path_for('sprite', kind='animated', pokemon_id=data['id']))
+    return {**data, 'details': details}
+
+async def prefetch_sprites(concurrency=8):
+    """Warm the sprite cache for every Pokemon listed in pokemon.json"""
+    initialize_database()
+    names = load_pokemon_names()
+    session = get_http_session()
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+    
+    async def warm(name):
+        nonlocal failures
+        async with semaphore:
+            try:
+                pokemon_data = await fetch_pokemon_data(session, name)
+            except HTTPException as e:
+                print(f"Skipping sprites for {name}: {e.detail}")
+                failures += 1
+                return
+            for kind in SPRITE_KINDS:
+                try:
+                    await fetch_sprite(session, kind, pokemon_data['id'])
+                except HTTPException as e:
+                    print(f"No {kind} sprite for {name}: {e.detail}")
+                    failures += 1
+    
+    try:
+        await asyncio.gather(*(warm(name) for name in names))
+    finally:
+        await close_http_session()
+    print(f"Prefetched sprites for {len(names)} Pokemon ({failures} missing)")
+
+def require_admin(request: Request):
+    """Reject requests that don't carry the configured admin token"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = request.headers.get("x-admin-token", "")
+    if not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
 
 # API endpoints
+@app.post("/admin/profile")
+async def start_profile(
+    request: Request,
+    seconds: Optional[float] = Query(None, gt=0),
+    request_count: Optional[int] = Query(None, alias="requests", gt=0)
+):
+    require_admin(request)
+    if (seconds is None) == (request_count is None):
+        raise HTTPException(status_code=400, detail="Pass exactly one of 'seconds' or 'requests'")
+    try:
+        output_path = PROFILER.start(seconds=seconds, request_count=request_count)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"running": True, "output": output_path}
+
+@app.get("/admin/profile")
+async def profile_status(request: Request):
+    require_admin(request)
+    return {"running": PROFILER.running, "output": PROFILER.output_path, "samples": PROFILER.samples}
+
 @app.get("/alive/")
 async def alive():
     print("I have been checked")
     return "I'm alive"
 
+@app.get("/sprites/{kind}/{pokemon_id}", name="sprite")
+async def sprite(
+    kind: str,
+    request: Request,
+    pokemon_id: int = Path(gt=0, le=SPRITE_ID_RANGES[-1][1])
+):
+    if kind not in SPRITE_KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown sprite kind: {kind}")
+    # Reject IDs PokeAPI can't have before touching the database or upstream
+    if not any(low <= pokemon_id <= high for low, high in SPRITE_ID_RANGES):
+        raise HTTPException(status_code=404, detail=f"Sprite {kind}/{pokemon_id} not found")
+    
+    digest, content_type = await fetch_sprite(get_http_session(), kind, pokemon_id)
+    return sprite_response(request, digest, content_type)
+
 @app.get("/info/{name}")
 async def info(name: str):
     print(f"Request received for: {name}")
@@ -595,107 +1285,130 @@ async def info(name: str):
         raise HTTPException(status_code=500, detail="Failed to load Pokemon names")
     
     # Find best match
-    best_match = get_close_matches(name, POKEMON_NAMES, n=1, cutoff=0.6)
+    with timed('match'):
+        best_match = NAME_INDEX.best_match(name, cutoff=0.6)
     if not best_match:
         raise HTTPException(status_code=404, detail="No close match found for the given name.")
     
-    best_match = best_match[0]
     print(f"Best match found: {best_match}")
     
     # Check if we already have processed data cached
     cached_data = check_processed_cache(best_match)
     if cached_data:
-        return cached_data
+        return with_sprite_urls(cached_data)
     
     # If not cached, fetch and process the data
-    async with aiohttp.ClientSession() as session:
-        # Fetch the main pokemon data
-        pokemon_data = await fetch_pokemon_data(session, best_match)
-        
-        # Start async tasks for additional data
-        species_task = fetch_species_data(session, pokemon_data['species']['name'])
-        movesets_task = fetch_movesets(session, best_match)
-        
-        # Process pokemon data while waiting for other requests
-        weight = pokemon_data['weight'] / 10
-        height = pokemon_data['height'] / 10
-        type_str = '\n'.join(capitalize_first_letter(t['type']['name']) for t in pokemon_data['types'])
-        
-        # Stats
-        stat_data = {stat['stat']['name']: stat['base_stat'] for stat in pokemon_data['stats']}
-        
-        # Abilities
-        abilities = [capitalize_first_letter(ability['ability']['name']) for ability in pokemon_data['abilities']]
-        
-        # Type effectiveness
-        type_names = [t['type']['name'] for t in pokemon_data['types']]
-        weaknesses = {}
-        strengths = {}
-        
-        for type_name in type_names:
-            try:
-                weaknesses.update(TYPE_WEAKNESSES.get(type_name, {}))
-                strengths.update(TYPE_STRENGTHS.get(type_name, {}))
-            except Exception as e:
-                print(f"Error processing type effectiveness: {e}")
-        
-        strong = list(strengths.keys())
-        weakness = list(weaknesses.keys())
-        
-        # Get species data and evolution chain
-        species_data = await species_task
-        evolution_chain_url = species_data['evolution_chain']['url']
-        evolution_chain_data = await fetch_evolution_chain(session, evolution_chain_url)
-        
-        # Process evolution chain
-        chain = evolution_chain_data['chain']
-        evolution_names = extract_evolution_names(chain)
-        evo_chain = [title_case(name) for name in evolution_names]
-        
-        # Process forms
-        varieties = species_data['varieties']
-        forms = [title_case(v['pokemon']['name']) for v in varieties]
-        
-        # Get movesets
-        print(f"[DEBUG] Waiting for movesets task to complete for {best_match}...")
-        movesets = await movesets_task
-        print(f"[DEBUG] Got movesets for {best_match}: {len(movesets)} sets")
-        
-        # Construct the final response
-        response_data = {
-            "name": title_case(format_display_name(pokemon_data['name'])),
-            "id": pokemon_data['id'],
-            "details": {
-                "type": type_str,
-                "weight": weight,
-                "height": height,
-                "preview": pokemon_data['sprites']['other']['official-artwork']['front_default'],
-                "animated": f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/animated/{pokemon_data['id']}.gif"
-            },
-            "evolution": {
-                "chain": evo_chain,
-                "forms": forms
-            },
-            "stats": stat_data,
-            "abilities": abilities,
-            "movesets": movesets,
-            "effectiveness": {
-                "strong_against": strong,
-                "weak_against": weakness
-            }
+    session = get_http_session()
+    
+    # Fetch the main pokemon data
+    pokemon_data = await fetch_pokemon_data(session, best_match)
+    
+    # Start async tasks for additional data
+    species_task = fetch_species_data(session, pokemon_data['species']['name'])
+    movesets_task = fetch_movesets(session, best_match)
+    
+    # Process pokemon data while waiting for other requests
+    weight = pokemon_data['weight'] / 10
+    height = pokemon_data['height'] / 10
+    type_str = '\n'.join(capitalize_first_letter(t['type']['name']) for t in pokemon_data['types'])
+    
+    # Stats
+    stat_data = {stat['stat']['name']: stat['base_stat'] for stat in pokemon_data['stats']}
+    
+    # Abilities
+    abilities = [capitalize_first_letter(ability['ability']['name']) for ability in pokemon_data['abilities']]
+    
+    # Type effectiveness
+    type_names = [t['type']['name'] for t in pokemon_data['types']]
+    weaknesses = {}
+    strengths = {}
+    
+    for type_name in type_names:
+        try:
+            weaknesses.update(TYPE_WEAKNESSES.get(type_name, {}))
+            strengths.update(TYPE_STRENGTHS.get(type_name, {}))
+        except Exception as e:
+            print(f"Error processing type effectiveness: {e}")
+    
+    strong = list(strengths.keys())
+    weakness = list(weaknesses.keys())
+    
+    # Get species data and evolution chain
+    species_data = await species_task
+    evolution_chain_url = species_data['evolution_chain']['url']
+    evolution_chain_data = await fetch_evolution_chain(session, evolution_chain_url)
+    
+    # Process evolution chain
+    chain = evolution_chain_data['chain']
+    evolution_names = extract_evolution_names(chain)
+    evo_chain = [title_case(name) for name in evolution_names]
+    
+    # Process forms
+    varieties = species_data['varieties']
+    forms = [title_case(v['pokemon']['name']) for v in varieties]
+    
+    # Get movesets
+    print(f"[DEBUG] Waiting for movesets task to complete for {best_match}...")
+    movesets = await movesets_task
+    print(f"[DEBUG] Got movesets for {best_match}: {len(movesets)} sets")
+    
+    # Construct the final response
+    response_data = {
+        "name": title_case(format_display_name(pokemon_data['name'])),
+        "id": pokemon_data['id'],
+        "details": {
+            "type": type_str,
+            "weight": weight,
+            "height": height,
+            "preview": pokemon_data['sprites']['other']['official-artwork']['front_default'],
+            "animated": f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/animated/{pokemon_data['id']}.gif"
+        },
+        "evolution": {
+            "chain": evo_chain,
+            "forms": forms
+        },
+        "stats": stat_data,
+        "abilities": abilities,
+        "movesets": movesets,
+        "effectiveness": {
+            "strong_against": strong,
+            "weak_against": weakness
         }
-        
-        # Save processed data to cache
-        save_processed_data(best_match, response_data)
-        
-        return response_data
+    }
+    
+    # Save processed data to cache
+    save_processed_data(best_match, response_data)
+    
+    return with_sprite_urls(response_data)
 
 @app.on_event("startup")
 async def startup_event():
     # Initialize database
     initialize_database()
-    # Load Pokemon names
-    load_pokemon_names()
+    # Load names and hot responses from the snapshot, rebuilding it if missing or stale
+    if not load_snapshot():
+        if not (build_snapshot() and load_snapshot()):
+            load_pokemon_names()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    PROFILER.stop()
+    await close_http_session()
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    import argparse
+    parser = argparse.ArgumentParser(description="PokéInfo backend server")
+    parser.add_argument("--prefetch-sprites", action="store_true",
+                        help="download every sprite for the names in pokemon.json, then exit")
+    parser.add_argument("--build-snapshot", action="store_true",
+                        help="write the startup snapshot of names and hot responses, then exit")
+    args = parser.parse_args()
+    
+    if args.prefetch_sprites:
+        asyncio.run(prefetch_sprites())
+    elif args.build_snapshot:
+        initialize_database()
+        build_snapshot()
+    else:
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8080)
@@ -132,6 +132,9 @@ const hideLoader = () => {
   loader.style.display = "none";
 };
 
+// Function to resolve a server-relative path (e.g. a sprite URL) against the API base URL
+const apiAssetUrl = (path) => (path ? `${getAPIUrl()}${path}` : "");
+
 // Function to safely get nested data with a default value if it doesn't exist
 const safeData = (data, path, defaultValue = "") => {
   if (!data) return defaultValue;
@@ -217,14 +220,14 @@ const createPokemonCard = (data) => {
   // Official artwork (static)
   const officialArtwork = createElement("img", {
     className: "pokemon-image official-art",
-    src: `https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/other/official-artwork/${data.id}.png`,
+    src: apiAssetUrl(safeData(data, "details.preview", "")),
     alt: safeData(data, "name", "Pokémon")
   });
   
   // Animated sprite
   const animatedSprite = createElement("img", {
     className: "pokemon-image animated-sprite",
-    src: `https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/versions/generation-v/black-white/animated/${data.id}.gif`,
+    src: apiAssetUrl(safeData(data, "details.animated", "")),
     alt: `${safeData(data, "name", "Pokémon")} animated`
   });
   
@@ -714,7 +717,7 @@ const displayPokemonData = async (data) => {
   }
 
   // Get sprite URL for color extraction
-  const spriteUrl = safeData(data, "details.preview", "");
+  const spriteUrl = apiAssetUrl(safeData(data, "details.preview", ""));
 
   try {
     // Create and load the image for color extraction